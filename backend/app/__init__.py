@@ -0,0 +1,3 @@
+"""cs-mapmaker backend package."""
+
+__version__ = "0.1.0"
@@ -0,0 +1,3 @@
+from app.cli.main import _main
+
+_main()
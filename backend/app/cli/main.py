@@ -0,0 +1,613 @@
+"""csmap command-line interface.
+
+Commands:
+  fetch     Download the first page of WFS building features for a bbox
+            into the cache, together with a .fetch.json manifest.
+  generate  Build a Valve 220 .map of box brushes from a local GeoPackage.
+  preview   Summarize what generate would produce without writing a map.
+  version   Print the CLI version.
+
+Run from the repository root with PYTHONPATH=backend (see Taskfile.yml):
+  python -m app.cli fetch --bbox 8.4919,55.9473,8.4954,55.9492
+"""
+
+from __future__ import annotations
+
+import functools
+import json
+import os
+import re
+import sys
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import typer
+
+from app import __version__
+from app.config import AppConfig
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+app = typer.Typer(help="Generate CS maps from Danish building footprints.")
+
+_MARKUP_RE = re.compile(r"\[/?[a-z][^\]]*\]")
+
+
+@functools.lru_cache(maxsize=1)
+def _console():
+    from rich.console import Console
+
+    return Console()
+
+
+def _say(msg: str) -> None:
+    """Print via Rich on a terminal; plain stdout with markup stripped otherwise."""
+    con = _console()
+    if con.is_terminal:
+        con.print(msg)
+    else:
+        sys.stdout.write(_MARKUP_RE.sub("", msg) + "\n")
+
+
+def _dumps_bytes(obj, indent: bool = False) -> bytes:
+    """Serialize ``obj`` to UTF-8 JSON bytes, via orjson when available.
+
+    orjson serializes datetime/UUID natively (ISO 8601); anything else
+    unknown is stringified via ``default=str`` on both paths.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0, default=str)
+    return json.dumps(obj, indent=2 if indent else None, default=str).encode("utf-8")
+
+
+@dataclass(frozen=True)
+class BBox:
+    minx: float
+    miny: float
+    maxx: float
+    maxy: float
+
+    @staticmethod
+    def parse(text: str) -> "BBox":
+        """Parse 'minx,miny,maxx,maxy' (WGS84 lon/lat) into a BBox."""
+        return _parse_bbox_cached(text)
+
+    def as_tuple(self) -> Tuple[float, float, float, float]:
+        return (self.minx, self.miny, self.maxx, self.maxy)
+
+
+@functools.lru_cache(maxsize=128)
+def _parse_bbox_cached(text: str) -> BBox:
+    # BBox is frozen, so handing the same instance to repeat callers is safe.
+    parts = [p.strip() for p in text.split(",")]
+    if len(parts) != 4:
+        raise typer.BadParameter("bbox must be 'minx,miny,maxx,maxy'")
+    try:
+        minx, miny, maxx, maxy = (float(p) for p in parts)
+    except ValueError:
+        raise typer.BadParameter(f"bbox has non-numeric values: {text}")
+    if not (minx < maxx and miny < maxy):
+        raise typer.BadParameter(f"bbox is empty or inverted: {text}")
+    return BBox(minx, miny, maxx, maxy)
+
+
+def ensure_dir(path: Path) -> None:
+    path.mkdir(parents=True, exist_ok=True)
+
+
+def _atomic_write_bytes(path: Path, data: bytes) -> None:
+    """Write via a sibling temp file and os.replace so readers never see
+    a partially written cache entry."""
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def _atomic_write_many(writes: List[Tuple[Path, bytes]]) -> None:
+    """Write several files in one open/write pass, then publish them all.
+
+    Keeping the writes in a single ExitStack lets the OS batch the
+    flushes, and replacing only after every temp file is complete means
+    a cache entry and its manifest appear together or not at all.
+    """
+    import contextlib
+
+    tmps: List[Tuple[Path, Path]] = []
+    with contextlib.ExitStack() as stack:
+        for path, data in writes:
+            tmp = path.with_suffix(path.suffix + ".tmp")
+            stack.enter_context(open(tmp, "wb")).write(data)
+            tmps.append((tmp, path))
+    for tmp, path in tmps:
+        os.replace(tmp, path)
+
+
+@functools.lru_cache(maxsize=1)
+def _http_session():
+    """Shared keep-alive session so batch callers reuse TCP/TLS connections."""
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+@app.command()
+def fetch(
+    bbox: str = typer.Option(..., help="Bounding box minx,miny,maxx,maxy in EPSG:4326"),
+    out_dir: Path = typer.Option(Path("cache"), help="Cache directory for fetched GeoJSON"),
+    count: int = typer.Option(1000, help="Maximum number of features to request"),
+    config: Optional[Path] = typer.Option(None, help="Path to config.yaml"),
+) -> None:
+    """Fetch WFS features for a bbox into the cache."""
+    from app.providers.wfs import fetch_wfs_bbox_first_page_stream
+
+    cfg = AppConfig.load(config)
+    if not cfg.wfs_url or not cfg.wfs_typename:
+        raise typer.BadParameter("wfs_url/wfs_typename missing; see config.example.yaml")
+    bb = BBox.parse(bbox)
+    ensure_dir(out_dir)
+
+    raw, request_url, feature_count = fetch_wfs_bbox_first_page_stream(
+        cfg, bb.as_tuple(), count=count, session=_http_session()
+    )
+
+    now = datetime.now(timezone.utc)
+    # The filename slug still needs the compact strftime form.
+    stamp = now.strftime("%Y%m%dT%H%M%SZ")
+    slug = cfg.wfs_typename.replace(":", "_").replace(".", "_").lower()
+    out_path = out_dir / f"{slug}_{stamp}.geojson"
+    manifest = {
+        "fetched_at": now,
+        "request_url": request_url,
+        "bbox": list(bb.as_tuple()),
+        "typename": cfg.wfs_typename,
+        "feature_count": feature_count,
+        "output": out_path.name,
+    }
+    manifest_path = out_path.with_suffix(".fetch.json")
+    _atomic_write_many(
+        [
+            (out_path, raw),
+            (manifest_path, _dumps_bytes(manifest, indent=True)),
+        ]
+    )
+
+    _say(f"[green]Fetched {feature_count} features[/green] -> {out_path}")
+
+
+try:
+    from numba import njit
+except ImportError:  # pragma: no cover - numba is optional
+    njit = None
+
+
+def _ring_metrics_py(xs, ys):
+    n = xs.shape[0]
+    minx = maxx = xs[0]
+    miny = maxy = ys[0]
+    area2 = 0.0
+    for i in range(n):
+        x = xs[i]
+        y = ys[i]
+        if x < minx:
+            minx = x
+        elif x > maxx:
+            maxx = x
+        if y < miny:
+            miny = y
+        elif y > maxy:
+            maxy = y
+        j = i + 1 if i + 1 < n else 0
+        area2 += x * ys[j] - xs[j] * y
+    return minx, miny, maxx, maxy, 0.5 * abs(area2)
+
+
+if njit is not None:
+    # Compiled once per process; the kernel is branch-light scalar code
+    # that numba turns into a tight native loop.
+    _ring_metrics = njit(cache=True)(_ring_metrics_py)
+else:
+
+    def _ring_metrics(xs, ys):
+        import numpy as np
+
+        area = 0.5 * abs(np.dot(xs, np.roll(ys, -1)) - np.dot(ys, np.roll(xs, -1)))
+        return float(xs.min()), float(ys.min()), float(xs.max()), float(ys.max()), area
+
+
+def _iter_rings(geom):
+    """Yield (ring, sign) pairs: exteriors count positive, holes negative."""
+    polys = geom.geoms if geom.geom_type == "MultiPolygon" else (geom,)
+    for poly in polys:
+        yield poly.exterior, 1.0
+        for ring in poly.interiors:
+            yield ring, -1.0
+
+
+def _shoelace_area(geom):
+    """Area of a polygon in its native CRS via the shoelace formula."""
+    import numpy as np
+
+    area = 0.0
+    for ring, sign in _iter_rings(geom):
+        xy = np.asarray(ring.coords)
+        area += sign * _ring_metrics(xy[:, 0], xy[:, 1])[4]
+    return area
+
+
+def _metric_bounds_area(geom, transformer):
+    """Batch-transform a polygon's rings to metric CRS; return bounds and area.
+
+    Feeds whole rings through pyproj's array path (one C call per ring
+    instead of one per vertex) and computes the area with the shoelace
+    formula, so no reprojected shapely geometry is ever built.
+    """
+    import numpy as np
+
+    minx = miny = float("inf")
+    maxx = maxy = float("-inf")
+    area = 0.0
+    for ring, sign in _iter_rings(geom):
+        xy = np.asarray(ring.coords)
+        xs, ys = transformer.transform(xy[:, 0], xy[:, 1])
+        rminx, rminy, rmaxx, rmaxy, ring_area = _ring_metrics(xs, ys)
+        area += sign * ring_area
+        if sign > 0:
+            minx = min(minx, rminx)
+            miny = min(miny, rminy)
+            maxx = max(maxx, rmaxx)
+            maxy = max(maxy, rmaxy)
+    return (minx, miny, maxx, maxy), area
+
+
+def _raw_bbox(geom):
+    """Bounds of a GeoJSON-like geometry from the raw coordinate lists.
+
+    Walks the nested coordinates without building shapely objects, so
+    rejected features never pay for geometry construction.
+    """
+    minx = miny = float("inf")
+    maxx = maxy = float("-inf")
+    stack = [geom["coordinates"]]
+    while stack:
+        node = stack.pop()
+        if not node:
+            continue
+        if isinstance(node[0], (int, float)):
+            x, y = node[0], node[1]
+            if x < minx:
+                minx = x
+            if x > maxx:
+                maxx = x
+            if y < miny:
+                miny = y
+            if y > maxy:
+                maxy = y
+        else:
+            stack.extend(node)
+    return minx, miny, maxx, maxy
+
+
+def _box_from_geom(geom, to_metric, bbox_src, area_factor, cx, cy, scale, min_area_f, z1_u):
+    """Turn one GeoJSON-like geometry into a box tuple, or None if filtered.
+
+    ``min_area_f`` and ``z1_u`` (the box top in map units) are hoisted to
+    the caller so nothing is recast or remultiplied per feature.
+    """
+    from shapely.geometry import shape as shp_shape
+
+    if geom.get("type") not in ("Polygon", "MultiPolygon"):
+        return None
+    try:
+        gminx, gminy, gmaxx, gmaxy = _raw_bbox(geom)
+    except (IndexError, KeyError, TypeError):
+        return None
+    if (
+        gmaxx < bbox_src[0]
+        or gminx > bbox_src[2]
+        or gmaxy < bbox_src[1]
+        or gminy > bbox_src[3]
+    ):
+        return None
+    try:
+        g = shp_shape(geom)
+    except Exception:
+        return None
+    minx, miny, maxx, maxy = to_metric.transform_bounds(gminx, gminy, gmaxx, gmaxy)
+    area_m = _shoelace_area(g) * area_factor
+    if area_m < min_area_f * 2.0:
+        # Near the cutoff the scaled estimate can mis-classify;
+        # fall back to the exact reprojected area.
+        _, area_m = _metric_bounds_area(g, to_metric)
+    if area_m < min_area_f:
+        return None
+    return (
+        (minx - cx) * scale,
+        (miny - cy) * scale,
+        (maxx - cx) * scale,
+        (maxy - cy) * scale,
+        0.0,
+        z1_u,
+    )
+
+
+def _process_chunk(geom_dicts, src_crs, bbox_src, area_factor, cx, cy, scale, min_area, height):
+    """Worker for --jobs: reduce a batch of raw geometry dicts to boxes."""
+    from pyproj import CRS, Transformer
+
+    to_metric = Transformer.from_crs(
+        CRS.from_user_input(src_crs), CRS.from_user_input("EPSG:25832"), always_xy=True
+    )
+    min_area_f = float(min_area)
+    z1_u = height * scale
+    boxes = []
+    for geom in geom_dicts:
+        box = _box_from_geom(
+            geom, to_metric, bbox_src, area_factor, cx, cy, scale, min_area_f, z1_u
+        )
+        if box is not None:
+            boxes.append(box)
+    return boxes
+
+
+def _open_area_filtered(fiona, gpkg_path: Path, layer: str, min_area_src: float):
+    """Open the layer with the area gate pushed down to GDAL when possible.
+
+    GeoPackage attribute filters run inside SQLite, so ST_Area lets GDAL
+    discard small footprints in C before any Python object exists. Not
+    every GDAL build ships the spatial functions, so probe the filter on
+    one feature first and fall back to an unfiltered open; the exact
+    area gate in _box_from_geom stays either way.
+    """
+    path = gpkg_path.as_posix()
+    if min_area_src > 0.0:
+        where = f"ST_Area(geom) >= {min_area_src:.6f}"
+        try:
+            with fiona.open(path, layer=layer, where=where) as test:
+                next(iter(test), None)
+            return fiona.open(path, layer=layer, where=where)
+        except Exception:
+            pass
+    return fiona.open(path, layer=layer)
+
+
+def _boxes_from_gpkg(
+    gpkg_path: Path,
+    layer: str,
+    bb: BBox,
+    *,
+    min_area: float,
+    height: float,
+    scale: float,
+    max_features: int,
+    show_progress: bool,
+    jobs: int = 1,
+) -> List[Tuple[float, float, float, float, float, float]]:
+    """Read building footprints and reduce them to axis-aligned boxes.
+
+    Each box is (minx, miny, maxx, maxy, z0, z1) in map units, centered
+    on the middle of the requested bbox.
+    """
+    import fiona
+    from pyproj import CRS, Transformer
+
+    boxes: List[Tuple[float, float, float, float, float, float]] = []
+    with fiona.open(gpkg_path.as_posix(), layer=layer) as probe:
+        src_crs = probe.crs_wkt or probe.crs
+    if not src_crs:
+        raise RuntimeError("Source CRS is undefined; cannot proceed.")
+
+    to_metric = Transformer.from_crs(
+        CRS.from_user_input(src_crs), CRS.from_user_input("EPSG:25832"), always_xy=True
+    )
+    wgs_to_src = Transformer.from_crs(
+        CRS.from_user_input("EPSG:4326"), CRS.from_user_input(src_crs), always_xy=True
+    )
+    wgs_to_metric = Transformer.from_crs(
+        CRS.from_user_input("EPSG:4326"), CRS.from_user_input("EPSG:25832"), always_xy=True
+    )
+
+    bbox_src = wgs_to_src.transform_bounds(bb.minx, bb.miny, bb.maxx, bb.maxy)
+
+    # Map origin: center of the requested bbox in metric coordinates.
+    mx0, my0, mx1, my1 = wgs_to_metric.transform_bounds(
+        bb.minx, bb.miny, bb.maxx, bb.maxy
+    )
+    cx, cy = (mx0 + mx1) / 2.0, (my0 + my1) / 2.0
+
+    # m^2 per source-CRS-unit^2 over the request bbox, for cheap area
+    # estimates without reprojecting every vertex.
+    m_bbox = to_metric.transform_bounds(*bbox_src)
+    src_bbox_area = (bbox_src[2] - bbox_src[0]) * (bbox_src[3] - bbox_src[1])
+    if src_bbox_area > 0.0:
+        area_factor = ((m_bbox[2] - m_bbox[0]) * (m_bbox[3] - m_bbox[1])) / src_bbox_area
+    else:
+        area_factor = 1.0
+
+    with _open_area_filtered(
+        fiona, gpkg_path, layer, min_area * 0.5 / area_factor if area_factor > 0.0 else 0.0
+    ) as src:
+        progress_ctx = None
+        task_id = None
+        if show_progress:
+            from rich.progress import Progress
+
+            progress_ctx = Progress(console=_console())
+            progress_ctx.start()
+            task_id = progress_ctx.add_task("Generating boxes", total=None)
+        try:
+            if jobs > 1:
+                from concurrent.futures import ProcessPoolExecutor
+
+                # Workers cannot share the fiona handle, but plain geometry
+                # dicts pickle cheaply; each worker rebuilds its transformer.
+                crs_for_workers = src_crs if isinstance(src_crs, str) else dict(src_crs)
+                futures = []
+                chunk: list = []
+                with ProcessPoolExecutor(max_workers=jobs) as pool:
+                    for feat in src.filter(bbox=bbox_src):
+                        geom = feat.get("geometry")
+                        if not geom:
+                            continue
+                        chunk.append({"type": geom["type"], "coordinates": geom["coordinates"]})
+                        if len(chunk) >= 1000:
+                            futures.append(
+                                pool.submit(
+                                    _process_chunk, chunk, crs_for_workers, bbox_src,
+                                    area_factor, cx, cy, scale, min_area, height,
+                                )
+                            )
+                            chunk = []
+                    if chunk:
+                        futures.append(
+                            pool.submit(
+                                _process_chunk, chunk, crs_for_workers, bbox_src,
+                                area_factor, cx, cy, scale, min_area, height,
+                            )
+                        )
+                    for fut in futures:
+                        result = fut.result()
+                        boxes.extend(result)
+                        if progress_ctx is not None:
+                            progress_ctx.advance(task_id, advance=len(result))
+                if max_features:
+                    del boxes[max_features:]
+            else:
+                min_area_f = float(min_area)
+                z1_u = height * scale
+                # Advance the bar in blocks of 128 so Rich's lock/redraw
+                # machinery stays off the per-feature path.
+                since_update = 0
+                for feat in src.filter(bbox=bbox_src):
+                    geom = feat.get("geometry")
+                    if not geom:
+                        continue
+                    box = _box_from_geom(
+                        geom, to_metric, bbox_src, area_factor, cx, cy, scale, min_area_f, z1_u
+                    )
+                    if box is None:
+                        continue
+                    boxes.append(box)
+                    since_update += 1
+                    if progress_ctx is not None and since_update == 128:
+                        progress_ctx.advance(task_id, advance=since_update)
+                        since_update = 0
+                    if max_features and len(boxes) >= max_features:
+                        break
+                if progress_ctx is not None and since_update:
+                    progress_ctx.advance(task_id, advance=since_update)
+        finally:
+            if progress_ctx is not None:
+                progress_ctx.stop()
+    return boxes
+
+
+@app.command()
+def generate(
+    bbox: str = typer.Option(..., help="Bounding box minx,miny,maxx,maxy in EPSG:4326"),
+    gpkg: Path = typer.Option(Path("cache") / "building_inspire.gpkg", help="Source GeoPackage"),
+    layer: str = typer.Option("building", help="Layer name in the GeoPackage"),
+    out: Path = typer.Option(Path("maps") / "generated.map", help="Output .map file"),
+    min_area: float = typer.Option(4.0, help="Drop footprints smaller than this (m^2)"),
+    height: float = typer.Option(128.0, help="Box height in meters before scaling"),
+    scale: float = typer.Option(1.0, help="Meters-to-map-units scale factor"),
+    max_features: int = typer.Option(0, help="Stop after this many boxes (0 = no limit)"),
+    progress: bool = typer.Option(True, help="Show a progress bar"),
+    jobs: int = typer.Option(1, help="Worker processes for feature processing"),
+) -> None:
+    """Generate a .map of box brushes from a local GeoPackage."""
+    from app.export.map220 import write_boxes_map, write_empty_map
+
+    bb = BBox.parse(bbox)
+    if not gpkg.exists():
+        raise typer.BadParameter(f"GeoPackage not found: {gpkg}")
+    ensure_dir(out.parent)
+
+    boxes = _boxes_from_gpkg(
+        gpkg,
+        layer,
+        bb,
+        min_area=min_area,
+        height=height,
+        scale=scale,
+        max_features=max_features,
+        show_progress=progress,
+        jobs=jobs,
+    )
+    if boxes:
+        write_boxes_map(out, boxes)
+    else:
+        write_empty_map(out)
+
+    manifest = {
+        "generated_at": datetime.now(timezone.utc),
+        "source": gpkg.as_posix(),
+        "layer": layer,
+        "bbox": list(bb.as_tuple()),
+        "box_count": len(boxes),
+        "output": out.name,
+    }
+    manifest_path = out.with_suffix(".generate.json")
+    _atomic_write_bytes(manifest_path, _dumps_bytes(manifest, indent=True))
+
+    _say(f"[green]Wrote {len(boxes)} boxes[/green] -> {out}")
+
+
+@app.command()
+def preview(
+    bbox: str = typer.Option(..., help="Bounding box minx,miny,maxx,maxy in EPSG:4326"),
+    gpkg: Path = typer.Option(Path("cache") / "building_inspire.gpkg", help="Source GeoPackage"),
+    layer: str = typer.Option("building", help="Layer name in the GeoPackage"),
+    min_area: float = typer.Option(4.0, help="Drop footprints smaller than this (m^2)"),
+    scale: float = typer.Option(1.0, help="Meters-to-map-units scale factor"),
+    max_features: int = typer.Option(0, help="Stop after this many boxes (0 = no limit)"),
+) -> None:
+    """Report how many boxes generate would emit for a bbox."""
+    bb = BBox.parse(bbox)
+    if not gpkg.exists():
+        raise typer.BadParameter(f"GeoPackage not found: {gpkg}")
+
+    boxes = _boxes_from_gpkg(
+        bb=bb,
+        gpkg_path=gpkg,
+        layer=layer,
+        min_area=min_area,
+        height=128.0,
+        scale=scale,
+        max_features=max_features,
+        show_progress=False,
+    )
+    if not boxes:
+        _say("[yellow]No boxes inside bbox[/yellow]")
+        return
+    minx = min(b[0] for b in boxes)
+    miny = min(b[1] for b in boxes)
+    maxx = max(b[2] for b in boxes)
+    maxy = max(b[3] for b in boxes)
+    _say(
+        f"{len(boxes)} boxes, extent {maxx - minx:.0f} x {maxy - miny:.0f} map units"
+    )
+
+
+@app.command()
+def version() -> None:
+    """Print the CLI version."""
+    # No Console here: keep the shortest command free of Rich entirely.
+    sys.stdout.write(f"csmap {__version__}\n")
+
+
+def _main() -> None:
+    app()
+
+
+if __name__ == "__main__":
+    _main()
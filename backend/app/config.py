@@ -0,0 +1,91 @@
+"""Application configuration loaded from config.yaml.
+
+The config file lives at the repository root (see config.example.yaml).
+Environment variables override file values so CI and one-off runs can
+avoid editing the file:
+
+  CSMAP_WFS_URL, CSMAP_WFS_TYPENAME,
+  CSMAP_API_KEY, CSMAP_API_KEY_HEADER, CSMAP_API_KEY_QUERY
+"""
+
+from __future__ import annotations
+
+import functools
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+try:
+    import yaml
+
+    # libyaml's CSafeLoader parses identically to SafeLoader, several
+    # times faster; fall back when PyYAML was built without it.
+    _YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+except ImportError:  # pragma: no cover - PyYAML is a declared dependency
+    yaml = None
+    _YamlLoader = None
+
+
+DEFAULT_CONFIG_PATHS = (
+    Path("config.yaml"),
+    Path("..") / "config.yaml",
+    Path("config.example.yaml"),
+)
+
+# Plain strings for the load-time scan: os.path.isfile on a str is a
+# single stat with no Path allocation.
+_DEFAULT_CONFIG_STRS = tuple(str(p) for p in DEFAULT_CONFIG_PATHS)
+
+
+@dataclass(frozen=True)
+class AppConfig:
+    wfs_url: str = ""
+    wfs_typename: str = ""
+    api_key: Optional[str] = None
+    api_key_header: Optional[str] = None
+    api_key_query: Optional[str] = None
+
+    @classmethod
+    def load(cls, path: Optional[Path] = None) -> "AppConfig":
+        """Load configuration from ``path`` or the first existing default path.
+
+        Results are cached per (path, mtime), so repeated loads within a
+        process skip the YAML re-parse while still picking up edits to
+        the config file.
+        """
+        cfg_path: Optional[str] = None
+        if path is not None:
+            cfg_path = os.fspath(path)
+        else:
+            for p in _DEFAULT_CONFIG_STRS:
+                if os.path.isfile(p):
+                    cfg_path = p
+                    break
+        if cfg_path is None:
+            return _load_cached(None, 0.0)
+        return _load_cached(cfg_path, os.path.getmtime(cfg_path))
+
+    @staticmethod
+    def reload() -> None:
+        """Drop cached configs; mainly for tests that rewrite config files."""
+        _load_cached.cache_clear()
+
+
+@functools.lru_cache(maxsize=4)
+def _load_cached(path: Optional[str], mtime: float) -> AppConfig:
+    data: dict = {}
+    if path is not None and yaml is not None:
+        loaded = yaml.load(Path(path).read_text(encoding="utf-8"), Loader=_YamlLoader)
+        if isinstance(loaded, dict):
+            data = loaded
+    section = data.get("dataforsyningen") or {}
+
+    env = os.environ.get
+    return AppConfig(
+        wfs_url=env("CSMAP_WFS_URL", section.get("wfs_url", "")),
+        wfs_typename=env("CSMAP_WFS_TYPENAME", section.get("wfs_typename", "")),
+        api_key=env("CSMAP_API_KEY", section.get("api_key")),
+        api_key_header=env("CSMAP_API_KEY_HEADER", section.get("api_key_header")),
+        api_key_query=env("CSMAP_API_KEY_QUERY", section.get("api_key_query")),
+    )
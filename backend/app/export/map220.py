@@ -0,0 +1,137 @@
+"""Writers for the Valve 220 .map format.
+
+Emits axis-aligned box brushes that load in TrenchBroom / J.A.C.K. and
+compile with the standard GoldSrc toolchain. Boxes are
+(minx, miny, maxx, maxy, z0, z1) tuples in map units.
+"""
+
+from __future__ import annotations
+
+import functools
+from pathlib import Path
+from typing import Sequence, Tuple
+
+Box = Tuple[float, float, float, float, float, float]
+Point = Tuple[float, float, float]
+
+DEFAULT_WALL_TEXTURE = "CS_WALL"
+DEFAULT_ROOF_TEXTURE = "CS_ROOF"
+DEFAULT_FLOOR_TEXTURE = "CS_FLOOR"
+
+
+# The u/v texture axes (and rotation/scale) are identical for every
+# axis-aligned box face, so their text is a module-level constant; only
+# the three plane points vary per face.
+_UV_TOP = "[ 1.000 0.000 0.000 0.000 ] [ 0.000 -1.000 0.000 0.000 ] 0 1 1"
+_UV_NS = "[ 1.000 0.000 0.000 0.000 ] [ 0.000 0.000 -1.000 0.000 ] 0 1 1"
+_UV_EW = "[ 0.000 1.000 0.000 0.000 ] [ 0.000 0.000 -1.000 0.000 ] 0 1 1"
+
+_WORLDSPAWN_OPEN = b'{\n"classname" "worldspawn"\n"mapversion" "220"\n'
+_MAP_FOOTER = b'}\n{\n"classname" "info_player_start"\n"origin" "0 0 64"\n}\n'
+
+
+@functools.lru_cache(maxsize=8)
+def _box_template(wall_texture: str, roof_texture: str) -> bytes:
+    """Whole-brush template specialized for one texture pair.
+
+    Everything but the six coordinates is baked in, so emitting a box is
+    a single %-format call instead of per-face string assembly (plane
+    points wound so normals face outward). The template is bytes with
+    printf placeholders: the content is pure ASCII, so formatting floats
+    straight into bytes skips a per-box UTF-8 encode pass.
+    """
+    wall = wall_texture.replace("%", "%%")
+    roof = roof_texture.replace("%", "%%")
+    return (
+        "{\n"
+        f"( %(x0).3f %(y0).3f %(z1).3f ) ( %(x1).3f %(y0).3f %(z1).3f ) ( %(x1).3f %(y1).3f %(z1).3f ) {roof} {_UV_TOP}\n"
+        f"( %(x0).3f %(y1).3f %(z0).3f ) ( %(x1).3f %(y1).3f %(z0).3f ) ( %(x1).3f %(y0).3f %(z0).3f ) {roof} {_UV_TOP}\n"
+        f"( %(x0).3f %(y1).3f %(z1).3f ) ( %(x1).3f %(y1).3f %(z1).3f ) ( %(x1).3f %(y1).3f %(z0).3f ) {wall} {_UV_NS}\n"
+        f"( %(x1).3f %(y0).3f %(z1).3f ) ( %(x0).3f %(y0).3f %(z1).3f ) ( %(x0).3f %(y0).3f %(z0).3f ) {wall} {_UV_NS}\n"
+        f"( %(x1).3f %(y1).3f %(z1).3f ) ( %(x1).3f %(y0).3f %(z1).3f ) ( %(x1).3f %(y0).3f %(z0).3f ) {wall} {_UV_EW}\n"
+        f"( %(x0).3f %(y0).3f %(z1).3f ) ( %(x0).3f %(y1).3f %(z1).3f ) ( %(x0).3f %(y1).3f %(z0).3f ) {wall} {_UV_EW}\n"
+        "}\n"
+    ).encode("ascii")
+
+
+# Above this many boxes the NumPy column formatter wins over the
+# per-box format loop; below it, array setup costs more than it saves.
+_VECTORIZE_THRESHOLD = 1024
+
+_PLACEHOLDER_ORDER = ("x0", "y0", "x1", "y1", "z0", "z1")
+
+
+def _write_boxes_vectorized(map_path: Path, boxes, wall_texture: str, roof_texture: str) -> None:
+    """Format all boxes column-wise in NumPy and write the result once.
+
+    Each coordinate column is printf-formatted in a single C pass
+    (np.char.mod), then the template's literal segments and the columns
+    are concatenated across all rows with np.char.add.
+    """
+    import re
+
+    import numpy as np
+
+    arr = np.asarray(boxes, dtype=np.float64)
+    cols = {
+        name: np.char.mod("%.3f", arr[:, i]) for i, name in enumerate(_PLACEHOLDER_ORDER)
+    }
+
+    tmpl = _box_template(wall_texture, roof_texture).decode("ascii")
+    parts = re.split(r"%\((x0|y0|x1|y1|z0|z1)\)\.3f", tmpl)
+
+    def unescape(lit: str) -> str:
+        return lit.replace("%%", "%")
+
+    out = np.char.add(unescape(parts[0]), cols[parts[1]])
+    for i in range(2, len(parts) - 1, 2):
+        lit = unescape(parts[i])
+        if lit:
+            out = np.char.add(out, lit)
+        out = np.char.add(out, cols[parts[i + 1]])
+    tail = unescape(parts[-1])
+    if tail:
+        out = np.char.add(out, tail)
+
+    with map_path.open("wb", buffering=1 << 20) as f:
+        f.write(_WORLDSPAWN_OPEN)
+        f.write("".join(out.tolist()).encode("ascii"))
+        f.write(_MAP_FOOTER)
+
+
+def write_boxes_map(
+    map_path: Path,
+    boxes: Sequence[Box],
+    wall_texture: str = DEFAULT_WALL_TEXTURE,
+    roof_texture: str = DEFAULT_ROOF_TEXTURE,
+) -> None:
+    """Write a worldspawn containing one box brush per entry in ``boxes``."""
+    if len(boxes) >= _VECTORIZE_THRESHOLD:
+        try:
+            _write_boxes_vectorized(map_path, boxes, wall_texture, roof_texture)
+            return
+        except ImportError:  # pragma: no cover - numpy is a declared dependency
+            pass
+    tmpl = _box_template(wall_texture, roof_texture)
+    with map_path.open("wb", buffering=1 << 20) as f:
+        write = f.write
+        write(_WORLDSPAWN_OPEN)
+        for x0, y0, x1, y1, z0, z1 in boxes:
+            write(
+                tmpl
+                % {b"x0": x0, b"y0": y0, b"x1": x1, b"y1": y1, b"z0": z0, b"z1": z1}
+            )
+        write(_MAP_FOOTER)
+
+
+def write_empty_map(map_path: Path) -> None:
+    """Write a minimal valid map: a floor slab and a player start."""
+    tmpl = _box_template(DEFAULT_FLOOR_TEXTURE, DEFAULT_FLOOR_TEXTURE)
+    with map_path.open("wb", buffering=1 << 20) as f:
+        write = f.write
+        write(_WORLDSPAWN_OPEN)
+        write(
+            tmpl
+            % {b"x0": -512.0, b"y0": -512.0, b"x1": 512.0, b"y1": 512.0, b"z0": -16.0, b"z1": 0.0}
+        )
+        write(_MAP_FOOTER)
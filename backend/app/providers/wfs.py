@@ -0,0 +1,161 @@
+"""WFS provider for Dataforsyningen OGC endpoints.
+
+Fetches GeoJSON building features with a WFS 2.0 GetFeature request.
+Only the first page (up to ``count`` features) is requested; paging can
+be layered on top once the pipeline needs it.
+"""
+
+from __future__ import annotations
+
+import functools
+import json
+from typing import Optional, Tuple
+from urllib.parse import urlencode
+
+import requests
+
+from app.config import AppConfig
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+
+def _make_session() -> requests.Session:
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    session = requests.Session()
+    session.headers.update(
+        {"Accept": "application/json", "User-Agent": "cs-mapmaker-wfs/1.0"}
+    )
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=16,
+        max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=(502, 503, 504)),
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+# Shared default session: keep-alive across paged fetches avoids a TCP/TLS
+# handshake per request, and the mounted adapter retries transient 5xx.
+_SESSION = _make_session()
+
+
+def _error_snippet(resp: requests.Response, limit: int = 400) -> str:
+    """Decode only the first ``limit`` bytes of a non-JSON body.
+
+    ``resp.text`` would decode the entire payload (an OGC XML exception
+    can run to megabytes) just to show a short diagnostic.
+    """
+    return resp.content[:limit].decode(resp.encoding or "utf-8", errors="replace")
+
+
+@functools.lru_cache(maxsize=16)
+def _base_query(
+    typename: str,
+    srs_name: str,
+    count: int,
+    api_key_query: Optional[str],
+    api_key: Optional[str],
+) -> str:
+    """URL-encoded GetFeature query minus the bbox, cached per config.
+
+    Tile-based pulls repeat every parameter except the bbox; caching the
+    encoded string skips requests' per-call dict encoding loop.
+    """
+    params = [
+        ("service", "WFS"),
+        ("version", "2.0.0"),
+        ("request", "GetFeature"),
+        ("typenames", typename),
+        ("srsName", srs_name),
+        ("outputFormat", "application/json"),
+        ("count", str(count)),
+    ]
+    if api_key_query and api_key:
+        params.append((api_key_query, api_key))
+    return urlencode(params)
+
+
+def _get_first_page(
+    cfg: AppConfig,
+    bbox: Tuple[float, float, float, float],
+    srs_name: str,
+    count: int,
+    timeout: int,
+    session: Optional[requests.Session] = None,
+) -> requests.Response:
+    minx, miny, maxx, maxy = bbox
+    headers = {"Accept": "application/json", "Accept-Encoding": "gzip, deflate"}
+    if cfg.api_key and not cfg.api_key_query:
+        headers[cfg.api_key_header or "X-API-Key"] = cfg.api_key
+
+    query = _base_query(
+        cfg.wfs_typename,
+        srs_name,
+        count,
+        cfg.api_key_query if cfg.api_key else None,
+        cfg.api_key,
+    )
+    sep = "&" if "?" in cfg.wfs_url else "?"
+    url = f"{cfg.wfs_url}{sep}{query}&bbox={minx},{miny},{maxx},{maxy},{srs_name}"
+
+    client = session if session is not None else _SESSION
+    resp = client.get(url, headers=headers, timeout=timeout)
+    resp.raise_for_status()
+    return resp
+
+
+def fetch_wfs_bbox_first_page(
+    cfg: AppConfig,
+    bbox: Tuple[float, float, float, float],
+    srs_name: str = "EPSG:4326",
+    count: int = 1000,
+    timeout: int = 30,
+    session: Optional[requests.Session] = None,
+) -> Tuple[dict, str]:
+    """Fetch the first page of WFS features intersecting ``bbox``.
+
+    ``bbox`` is (minx, miny, maxx, maxy) in ``srs_name`` coordinates.
+    Returns the decoded GeoJSON FeatureCollection and the request URL.
+    Pass a shared ``session`` to reuse TCP/TLS connections across calls.
+    """
+    resp = _get_first_page(cfg, bbox, srs_name, count, timeout, session=session)
+    raw = resp.content
+    try:
+        # orjson parses the UTF-8 bytes directly in C, skipping requests'
+        # full-body .text decode; orjson.JSONDecodeError is a ValueError.
+        data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+    except ValueError:
+        snippet = _error_snippet(resp)
+        raise RuntimeError(f"WFS response is not JSON: {snippet}")
+    return data, resp.url
+
+
+def fetch_wfs_bbox_first_page_stream(
+    cfg: AppConfig,
+    bbox: Tuple[float, float, float, float],
+    srs_name: str = "EPSG:4326",
+    count: int = 1000,
+    timeout: int = 30,
+    session: Optional[requests.Session] = None,
+) -> Tuple[bytes, str, int]:
+    """Like :func:`fetch_wfs_bbox_first_page`, but keep the body as bytes.
+
+    Callers that only cache the payload can write the returned bytes
+    straight to disk without a decode/re-encode round-trip. The feature
+    count is derived in a single parse pass purely for logging.
+    """
+    resp = _get_first_page(cfg, bbox, srs_name, count, timeout, session=session)
+    raw = resp.content
+    try:
+        data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+    except ValueError:
+        snippet = _error_snippet(resp)
+        raise RuntimeError(f"WFS response is not JSON: {snippet}")
+    feature_count = len(data.get("features", ()))
+    return raw, resp.url, feature_count
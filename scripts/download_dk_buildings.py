@@ -9,7 +9,7 @@ Usage:
   python scripts/download_dk_buildings.py --output cache --keep-zip
 
 Notes:
-- Uses only the Python standard library (no extra deps).
+- Uses only the Python standard library (tqdm is picked up for progress if installed).
 - Skips re-downloading unless --force-download is provided when the ZIP already exists.
 - Extracts into the output directory; prevents Zip Slip via path validation.
 """
@@ -19,6 +19,7 @@ from __future__ import annotations
 import argparse
 import os
 import shutil
+import struct
 import sys
 import time
 from pathlib import Path
@@ -26,22 +27,55 @@ from typing import Optional
 from urllib.request import Request, urlopen
 from urllib.error import URLError, HTTPError
 import zipfile
+import zlib
+
+try:
+    # Coalesces redraws to ~10 Hz; the fallback renderer formats on
+    # every chunk, which adds up over a multi-GB download.
+    from tqdm.auto import tqdm
+except ImportError:  # pragma: no cover - stays stdlib-only without it
+    tqdm = None
 
 
 DEFAULT_URL = (
     "https://ftp.sdfe.dk/main.html?download&weblink=ca102693c712ad4159e4a6f343da60d5&realfilename=DK%5FBuilding%2Ezip"
 )
 
+# Copy stride for downloads and extraction. 4 MiB keeps syscall count low
+# on a multi-GB archive without holding meaningful memory.
+_COPY_CHUNK = 4 * 1024 * 1024
+
+# Entries above this size take the bulk paths below: sendfile for stored
+# members, a wider copy stride for deflated ones.
+_LARGE_ENTRY = 64 * 1024 * 1024
+_LARGE_COPY_CHUNK = 8 * 1024 * 1024
+
+
+class _ProgressReader:
+    """File-like wrapper that reports bytes read to a callback."""
+
+    def __init__(self, raw, callback):
+        self._raw = raw
+        self._callback = callback
+
+    def read(self, size: int = -1) -> bytes:
+        chunk = self._raw.read(size)
+        if chunk:
+            self._callback(len(chunk))
+        return chunk
+
+
+_UNITS = ("B", "KB", "MB", "GB", "TB")
+
 
 def human_size(num_bytes: Optional[int]) -> str:
     if num_bytes is None:
         return "unknown"
-    units = ["B", "KB", "MB", "GB", "TB"]
-    size = float(num_bytes)
-    for unit in units:
-        if size < 1024.0 or unit == units[-1]:
-            return f"{size:0.1f} {unit}"
-        size /= 1024.0
+    # Unit index straight from the bit length: one C-level call instead
+    # of a divide-and-compare loop, called twice per progress tick.
+    n = int(num_bytes)
+    i = min((n.bit_length() - 1) // 10, len(_UNITS) - 1) if n > 0 else 0
+    return f"{n / (1 << (i * 10)):0.1f} {_UNITS[i]}"
 
 
 def _format_duration(seconds: float) -> str:
@@ -89,19 +123,24 @@ def download_file(url: str, dest: Path, quiet: bool = False, timeout: int = 60)
                 size_str = human_size(total)
                 print(f"Downloading to {dest} ({size_str})...")
 
-            chunk_size = 1024 * 1024  # 1 MiB
-            bytes_read = 0
             t0 = time.time()
-            with open(dest, "wb") as f:
-                while True:
-                    chunk = resp.read(chunk_size)
-                    if not chunk:
-                        break
-                    f.write(chunk)
-                    bytes_read += len(chunk)
+            if not quiet and tqdm is not None:
+                with open(dest, "wb") as f, tqdm(
+                    total=total, unit="B", unit_scale=True, unit_divisor=1024
+                ) as bar:
+                    shutil.copyfileobj(_ProgressReader(resp, bar.update), f, length=_COPY_CHUNK)
+            else:
+                bytes_read = 0
+
+                def _tick(n: int) -> None:
+                    nonlocal bytes_read
+                    bytes_read += n
                     if not quiet:
                         prog = _render_progress(bytes_read, total, t0)
                         print(f"\r{prog}", end="", flush=True)
+
+                with open(dest, "wb") as f:
+                    shutil.copyfileobj(_ProgressReader(resp, _tick), f, length=_COPY_CHUNK)
             if not quiet:
                 dt = time.time() - t0
                 print(f"\nDone in {dt:0.1f}s.")
@@ -111,6 +150,59 @@ def download_file(url: str, dest: Path, quiet: bool = False, timeout: int = 60)
         raise SystemExit(f"URL error: {e.reason}")
 
 
+def _copy_stored_entry(zip_path: Path, info: zipfile.ZipInfo, target: str) -> bool:
+    """Copy an uncompressed zip member with os.sendfile, kernel to kernel.
+
+    Returns False (leaving the caller to re-extract normally) when
+    sendfile is unavailable or the local header looks unexpected.
+    """
+    if not hasattr(os, "sendfile"):
+        return False
+    with open(zip_path, "rb") as zsrc, open(target, "wb") as dst:
+        # Local file header: 30 fixed bytes, then file name and extra field.
+        zsrc.seek(info.header_offset)
+        header = zsrc.read(30)
+        if len(header) != 30 or header[:4] != b"PK\x03\x04":
+            return False
+        name_len, extra_len = struct.unpack("<HH", header[26:30])
+        offset = info.header_offset + 30 + name_len + extra_len
+        src_fd = zsrc.fileno()
+        if hasattr(os, "posix_fadvise"):
+            os.posix_fadvise(src_fd, offset, info.file_size, os.POSIX_FADV_SEQUENTIAL)
+        remaining = info.file_size
+        try:
+            while remaining:
+                sent = os.sendfile(dst.fileno(), src_fd, offset, remaining)
+                if sent == 0:
+                    return False
+                offset += sent
+                remaining -= sent
+        except OSError:
+            return False
+    return True
+
+
+def _already_extracted(target: str, info: zipfile.ZipInfo) -> bool:
+    """True if ``target`` already holds this entry's exact content.
+
+    Checked via size then CRC32 against the zip central directory, so an
+    interrupted run only re-extracts what is missing or truncated.
+    """
+    try:
+        if os.path.getsize(target) != info.file_size:
+            return False
+    except OSError:
+        return False
+    crc = 0
+    with open(target, "rb", buffering=0) as f:
+        while True:
+            chunk = f.read(_COPY_CHUNK)
+            if not chunk:
+                break
+            crc = zlib.crc32(chunk, crc)
+    return crc == info.CRC
+
+
 def safe_extract_zip(zip_path: Path, dest_dir: Path, quiet: bool = False) -> None:
     dest_dir.mkdir(parents=True, exist_ok=True)
 
@@ -118,22 +210,48 @@ def safe_extract_zip(zip_path: Path, dest_dir: Path, quiet: bool = False) -> Non
         print(f"Extracting {zip_path} -> {dest_dir}")
 
     base = dest_dir.resolve()
+    base_str = str(base) + os.sep
+    last_parent: Optional[str] = None
     with zipfile.ZipFile(zip_path) as zf:
-        for info in zf.infolist():
-            # Normalize the path to prevent Zip Slip
-            target = (dest_dir / info.filename).resolve()
-            try:
-                target.relative_to(base)
-            except ValueError:
+        # Sorting groups entries by directory, so the last_parent cache
+        # below reduces mkdir calls to roughly one per directory even
+        # when the archive interleaves files from different folders.
+        for info in sorted(zf.infolist(), key=lambda i: i.filename):
+            # Zip Slip check as a pure string compare: normpath never
+            # touches the filesystem, unlike resolve() which stats every
+            # path component for each of the archive's entries.
+            target = os.path.normpath(os.path.join(base_str, info.filename))
+            if not target.startswith(base_str):
                 raise SystemExit(f"Refusing to extract outside destination: {info.filename}")
+            # Symlink entries get the stat-based check, since they could
+            # redirect later entries outside the destination.
+            if (info.external_attr >> 16) & 0o170000 == 0o120000:
+                try:
+                    Path(target).resolve().relative_to(base)
+                except ValueError:
+                    raise SystemExit(f"Refusing to extract outside destination: {info.filename}")
 
             if info.is_dir():
-                target.mkdir(parents=True, exist_ok=True)
+                os.makedirs(target, exist_ok=True)
                 continue
 
-            target.parent.mkdir(parents=True, exist_ok=True)
+            # Consecutive entries usually share a directory; only mkdir
+            # when the parent actually changes.
+            parent = os.path.dirname(target)
+            if parent != last_parent:
+                os.makedirs(parent, exist_ok=True)
+                last_parent = parent
+            if _already_extracted(target, info):
+                continue
+            large = info.file_size > _LARGE_ENTRY
+            if (
+                large
+                and info.compress_type == zipfile.ZIP_STORED
+                and _copy_stored_entry(zip_path, info, target)
+            ):
+                continue
             with zf.open(info, "r") as src, open(target, "wb") as dst:
-                shutil.copyfileobj(src, dst)
+                shutil.copyfileobj(src, dst, length=_LARGE_COPY_CHUNK if large else _COPY_CHUNK)
 
 
 def parse_args(argv: list[str]) -> argparse.Namespace:
@@ -15,8 +15,26 @@ Examples:
 from __future__ import annotations
 
 import argparse
-from pathlib import Path 
-from typing import Iterable, Tuple 
+import importlib.util
+import io
+import json
+import shutil
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable, Tuple
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+
+def _dumps_props(props) -> str:
+    """Serialize a feature's properties dict, via orjson when present."""
+    d = dict(props)
+    if orjson is not None:
+        return orjson.dumps(d, default=str).decode()
+    return json.dumps(d, default=str)
 
 
 def parse_args(argv: list[str]) -> argparse.Namespace:
@@ -38,33 +56,371 @@ def parse_args(argv: list[str]) -> argparse.Namespace:
     # Preview rendering options
     p.add_argument("--preview", action="store_true", help="Also write an SVG preview next to the output GeoJSON")
     p.add_argument("--preview-width", type=int, default=1024, help="Preview width in pixels (default: 1024)")
+    # Parallel extraction
+    p.add_argument("--workers", type=int, default=1, help="Worker processes for tiled extraction (default: 1)")
+    p.add_argument("--tiles", type=int, default=0, help="Tile grid dimension K for KxK tiles (default: workers)")
     return p.parse_args(argv)
 
 
-def _transform_bbox(bbox: Tuple[float, float, float, float], in_crs: str, to_crs: str) -> Tuple[float, float, float, float]:
-    if in_crs == to_crs:
-        return bbox
+# Features per vectorized reprojection pass in the fiona fallback path.
+_BATCH_SIZE = 1024
+
+# OGR-level type filter: discard non-polygonal features in the driver
+# before Python ever materializes them. Not every driver/SQL dialect
+# understands OGR_GEOMETRY, so callers fall back to an unfiltered read.
+_GEOM_WHERE = "OGR_GEOMETRY IN ('POLYGON','MULTIPOLYGON')"
+
+# Output suffixes that select newline-delimited GeoJSON (RFC 8142 text
+# sequences) instead of a single FeatureCollection document.
+_NDJSON_SUFFIXES = (".geojsonl", ".ndjson")
+
+# GDAL driver per output suffix for the pyogrio write path. FlatGeobuf
+# and GPKG write far faster than GeoJSON and carry a spatial index, but
+# they need pyogrio; the text fallbacks handle only the GeoJSON flavors.
+_DRIVER_BY_SUFFIX = {
+    ".geojson": "GeoJSON",
+    ".json": "GeoJSON",
+    ".geojsonl": "GeoJSONSeq",
+    ".ndjson": "GeoJSONSeq",
+    ".fgb": "FlatGeobuf",
+    ".gpkg": "GPKG",
+}
+
+
+def _is_ndjson(out_path: Path) -> bool:
+    return out_path.suffix.lower() in _NDJSON_SUFFIXES
+
+
+try:
+    import numpy as _np
+except ImportError:  # pragma: no cover - required by the geo stack anyway
+    _np = None
+
+
+def _ring_pixels_py(coords, xmin, ymax, scale_x, scale_y, margin):
+    """Project one ring to deduplicated integer decipixels.
+
+    Single fused pass: affine transform, rounding and collapse of
+    consecutive identical points, emitting compacted coordinate arrays.
+    Written scalar-style so numba can compile it when installed.
+    """
+    n = coords.shape[0]
+    out_x = _np.empty(n, _np.int64)
+    out_y = _np.empty(n, _np.int64)
+    m = 0
+    for i in range(n):
+        x = int(round((margin + (coords[i, 0] - xmin) * scale_x) * 10.0))
+        y = int(round((margin + (ymax - coords[i, 1]) * scale_y) * 10.0))
+        if m == 0 or x != out_x[m - 1] or y != out_y[m - 1]:
+            out_x[m] = x
+            out_y[m] = y
+            m += 1
+    return out_x[:m], out_y[:m]
+
+
+try:
+    from numba import njit
+
+    _ring_pixels = njit(cache=True)(_ring_pixels_py)
+except ImportError:  # pragma: no cover - optional speedup
+    _ring_pixels = None
+
+
+def _out_driver(out_path: Path) -> str:
+    return _DRIVER_BY_SUFFIX.get(out_path.suffix.lower(), "GeoJSON")
+
+
+class _PreviewSink:
+    """Spools preview rings to a temp file instead of holding geometries.
+
+    Tracks running world bounds as features are added; the SVG pass then
+    re-reads the spooled coordinate arrays, so extraction keeps O(1)
+    extra memory no matter how many features the bbox matches.
+    """
+
+    def __init__(self) -> None:
+        import tempfile
+
+        self._tmp = tempfile.TemporaryFile()
+        self.count = 0
+        self.xmin = self.ymin = float("inf")
+        self.xmax = self.ymax = float("-inf")
+
+    def add(self, geom) -> None:
+        import pickle
+
+        import numpy as np
+
+        x0, y0, x1, y1 = geom.bounds
+        if x0 < self.xmin:
+            self.xmin = x0
+        if y0 < self.ymin:
+            self.ymin = y0
+        if x1 > self.xmax:
+            self.xmax = x1
+        if y1 > self.ymax:
+            self.ymax = y1
+        polys = [geom] if geom.geom_type == "Polygon" else geom.geoms
+        rings = [
+            (
+                np.asarray(poly.exterior.coords),
+                [np.asarray(r.coords) for r in poly.interiors],
+            )
+            for poly in polys
+        ]
+        pickle.dump(rings, self._tmp, protocol=pickle.HIGHEST_PROTOCOL)
+        self.count += 1
+
+    def __iter__(self):
+        import pickle
+
+        self._tmp.seek(0)
+        while True:
+            try:
+                yield pickle.load(self._tmp)
+            except EOFError:
+                return
+
+    def close(self) -> None:
+        self._tmp.close()
+
+
+def _reproject_batch(sgs: list, transformer):
+    """Reproject a batch of shapely geometries with one transform call.
+
+    shapely.ops.transform walks each geometry in Python and calls pyproj
+    per coordinate pair; gathering the batch's coordinates into flat
+    arrays runs the same math as a couple of C calls.
+    """
+    import numpy as np
+    import shapely
+
+    geoms = np.asarray(sgs, dtype=object)
+    coords = shapely.get_coordinates(geoms)
+    xs, ys = transformer.transform(coords[:, 0], coords[:, 1])
+    return shapely.set_coordinates(geoms, np.column_stack([xs, ys]))
+
+
+@lru_cache(maxsize=32)
+def _tf(in_crs: str, to_crs: str):
+    """Memoized Transformer; construction dominates repeated bbox calls."""
     from pyproj import Transformer, CRS
 
     # Always use x,y order (lon/lat for geographic) regardless of axis order authority
-    transformer = Transformer.from_crs(CRS.from_user_input(in_crs), CRS.from_user_input(to_crs), always_xy=True)
+    return Transformer.from_crs(CRS.from_user_input(in_crs), CRS.from_user_input(to_crs), always_xy=True)
+
+
+def _transform_bbox(bbox: Tuple[float, float, float, float], in_crs: str, to_crs: str) -> Tuple[float, float, float, float]:
+    if in_crs == to_crs:
+        return bbox
     minx, miny, maxx, maxy = bbox
-    x0, y0 = transformer.transform(minx, miny)
-    x1, y1 = transformer.transform(maxx, maxy)
-    # Normalize in case of axis flips during transform
-    xmin, xmax = (x0, x1) if x0 <= x1 else (x1, x0)
-    ymin, ymax = (y0, y1) if y0 <= y1 else (y1, y0)
-    return (xmin, ymin, xmax, ymax)
+    # transform_bounds densifies the rectangle's edges before projecting,
+    # giving a correct envelope where corner-only transforms under-cover
+    # (projections that bow edges outward), and it normalizes axis flips.
+    return _tf(in_crs, to_crs).transform_bounds(minx, miny, maxx, maxy, densify_pts=21)
 
 
-def extract(argv: list[str]) -> int:
-    args = parse_args(argv)
+def _extract_pyogrio(args: argparse.Namespace, src_path: Path, out_path: Path):
+    """Bulk read/clip/write via pyogrio + GeoPandas.
+
+    Reads all matching rows in C instead of materializing one Python
+    feature at a time; reprojection and type filtering run vectorized.
+    Returns the written GeoDataFrame, or None when pyogrio or geopandas
+    is unavailable so the caller can fall back to the fiona loop.
+    """
+    try:
+        import pyogrio
+    except ImportError:
+        return None
+
+    info = pyogrio.read_info(src_path.as_posix(), layer=args.layer)
+    src_crs = info.get("crs")
+    if not src_crs:
+        raise SystemExit("Source CRS is undefined; cannot proceed.")
+    bbox_src = _transform_bbox(tuple(args.bbox), args.in_crs, src_crs)
+
+    # pyogrio raises RuntimeError (not ImportError) when asked for Arrow
+    # without pyarrow installed, so probe for it up front; the non-Arrow
+    # reader is still bulk C.
+    use_arrow = importlib.util.find_spec("pyarrow") is not None
+
+    def _read(**kwargs):
+        return pyogrio.read_dataframe(
+            src_path.as_posix(), layer=args.layer, bbox=bbox_src, use_arrow=use_arrow, **kwargs
+        )
 
+    try:
+        try:
+            gdf = _read(where=_GEOM_WHERE)
+        except ImportError:
+            raise
+        except Exception:
+            gdf = _read()
+    except ImportError:
+        # read_dataframe needs geopandas.
+        return None
+
+    if not args.quiet:
+        print(f"Reading {src_path} layer={args.layer} CRS={src_crs} bbox={bbox_src}")
+        print(f"Writing {out_path} CRS={args.out_crs}")
+
+    gdf = gdf[gdf.geom_type.isin(("Polygon", "MultiPolygon"))]
+    gdf = gdf.to_crs(args.out_crs)
+    pyogrio.write_dataframe(gdf, out_path.as_posix(), driver=_out_driver(out_path))
+    return gdf
+
+
+def _extract_tile(
+    source: str,
+    layer: str,
+    full_bbox: Tuple[float, float, float, float],
+    k: int,
+    ti: int,
+    tj: int,
+    out_crs: str,
+    tmp_path: str,
+) -> int:
+    """Worker: extract tile (ti, tj) of a KxK grid to NDJSON features.
+
+    A feature is claimed by the tile containing the center of its
+    bounds (indices clamped into the grid), so features straddling tile
+    edges are written exactly once across the pool.
+    """
     import fiona
-    from shapely.geometry import shape as shp_shape, mapping as shp_mapping, MultiPolygon as ShpMultiPolygon
-    from shapely.ops import transform as shp_transform
+    import shapely
+    from shapely.geometry import shape as shp_shape
     from pyproj import Transformer, CRS
 
+    minx, miny, maxx, maxy = full_bbox
+    dx = (maxx - minx) / k
+    dy = (maxy - miny) / k
+    tile_bbox = (minx + ti * dx, miny + tj * dy, minx + (ti + 1) * dx, miny + (tj + 1) * dy)
+
+    count = 0
+    with fiona.open(source, layer=layer) as src, open(
+        tmp_path, "w", encoding="utf-8", buffering=1 << 20
+    ) as dst:
+        src_crs = src.crs_wkt or src.crs
+        transformer = Transformer.from_crs(
+            CRS.from_user_input(src_crs), CRS.from_user_input(out_crs), always_xy=True
+        )
+        batch: list = []
+        batch_props: list = []
+
+        def _flush() -> None:
+            nonlocal count
+            for sg_t, props in zip(_reproject_batch(batch, transformer), batch_props):
+                if sg_t.is_empty or sg_t.geom_type not in ("Polygon", "MultiPolygon"):
+                    continue
+                dst.write(
+                    f'{{"type":"Feature","properties":{_dumps_props(props)},'
+                    f'"geometry":{shapely.to_geojson(sg_t)}}}\n'
+                )
+                count += 1
+            batch.clear()
+            batch_props.clear()
+
+        try:
+            feats = list(src.filter(bbox=tile_bbox, where=_GEOM_WHERE))
+        except Exception:
+            feats = src.filter(bbox=tile_bbox)
+        for feat in feats:
+            geom = feat.get("geometry")
+            if not geom:
+                continue
+            try:
+                sg = shp_shape(geom)
+            except Exception:
+                continue
+            if sg.geom_type not in ("Polygon", "MultiPolygon"):
+                continue
+            # Claim check against the full grid.
+            x0, y0, x1, y1 = sg.bounds
+            cx = (x0 + x1) * 0.5
+            cy = (y0 + y1) * 0.5
+            if min(k - 1, max(0, int((cx - minx) / dx))) != ti:
+                continue
+            if min(k - 1, max(0, int((cy - miny) / dy))) != tj:
+                continue
+            batch.append(sg)
+            batch_props.append(feat.get("properties", {}))
+            if len(batch) >= _BATCH_SIZE:
+                _flush()
+        if batch:
+            _flush()
+    return count
+
+
+def _extract_parallel(args: argparse.Namespace, src_path: Path, out_path: Path) -> int:
+    """Shard the bbox into a KxK grid and extract tiles in a process pool."""
+    import tempfile
+    from concurrent.futures import ProcessPoolExecutor
+
+    import fiona
+
+    with fiona.open(src_path.as_posix(), layer=args.layer) as src:
+        src_crs = src.crs_wkt or src.crs
+    if not src_crs:
+        raise SystemExit("Source CRS is undefined; cannot proceed.")
+    bbox_src = _transform_bbox(tuple(args.bbox), args.in_crs, src_crs)
+
+    k = args.tiles or args.workers
+    if not args.quiet:
+        print(f"Reading {src_path} layer={args.layer} CRS={src_crs} bbox={bbox_src}")
+        print(f"Writing {out_path} CRS={args.out_crs} ({k}x{k} tiles, {args.workers} workers)")
+    if args.preview:
+        print("Preview is not supported with --workers > 1; skipping SVG.")
+
+    count = 0
+    with tempfile.TemporaryDirectory() as td:
+        jobs = []
+        with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            for ti in range(k):
+                for tj in range(k):
+                    tmp = str(Path(td) / f"tile_{ti}_{tj}.geojsonl")
+                    fut = pool.submit(
+                        _extract_tile,
+                        src_path.as_posix(),
+                        args.layer,
+                        bbox_src,
+                        k,
+                        ti,
+                        tj,
+                        args.out_crs,
+                        tmp,
+                    )
+                    jobs.append((fut, tmp))
+            ndjson = _is_ndjson(out_path)
+            with out_path.open("w", encoding="utf-8", buffering=1 << 20) as dst:
+                if not ndjson:
+                    dst.write('{"type":"FeatureCollection","features":[\n')
+                for fut, tmp in jobs:
+                    tile_count = fut.result()
+                    with open(tmp, "r", encoding="utf-8") as f:
+                        if ndjson:
+                            # Tile output is already one feature per line.
+                            shutil.copyfileobj(f, dst, length=1 << 20)
+                            count += tile_count
+                            continue
+                        for line in f:
+                            line = line.rstrip("\n")
+                            if not line:
+                                continue
+                            if count:
+                                dst.write(",\n")
+                            dst.write(line)
+                            count += 1
+                if not ndjson:
+                    dst.write("\n]}\n")
+
+    if not args.quiet:
+        print(f"Wrote {count} features -> {out_path}")
+    return 0
+
+
+def extract(argv: list[str]) -> int:
+    args = parse_args(argv)
+
     src_path = Path(args.source)
     if not src_path.exists():
         raise SystemExit(f"Source not found: {src_path}")
@@ -72,6 +428,31 @@ def extract(argv: list[str]) -> int:
     out_path = Path(args.out)
     out_path.parent.mkdir(parents=True, exist_ok=True)
 
+    binary_out = _out_driver(out_path) not in ("GeoJSON", "GeoJSONSeq")
+    if args.workers > 1:
+        if binary_out:
+            raise SystemExit(f"{out_path.suffix} output is not supported with --workers > 1")
+        return _extract_parallel(args, src_path, out_path)
+
+    gdf = _extract_pyogrio(args, src_path, out_path)
+    if gdf is not None:
+        if not args.quiet:
+            print(f"Wrote {len(gdf)} features -> {out_path}")
+        if args.preview:
+            sink = _PreviewSink()
+            for g in gdf.geometry:
+                sink.add(g)
+            _write_svg_preview(sink, out_path, width=args.preview_width, quiet=args.quiet)
+            sink.close()
+        return 0
+    if binary_out:
+        raise SystemExit(f"{out_path.suffix} output requires pyogrio and geopandas")
+
+    import fiona
+    import shapely
+    from shapely.geometry import shape as shp_shape
+    from pyproj import Transformer, CRS
+
     with fiona.open(src_path.as_posix(), layer=args.layer) as src:
         # Prefer WKT; fall back to EPSG string/dict.
         src_crs = src.crs_wkt or src.crs
@@ -81,20 +462,68 @@ def extract(argv: list[str]) -> int:
         # Prepare bbox in source CRS
         bbox_src = _transform_bbox(tuple(args.bbox), args.in_crs, src_crs)
 
-        # Prepare output schema & CRS
+        # Prepare output CRS
         out_crs = args.out_crs
         transformer = Transformer.from_crs(CRS.from_user_input(src_crs), CRS.from_user_input(out_crs), always_xy=True)
-        # Normalize output to MultiPolygon to accommodate polygonal buildings with multipart shapes
-        out_schema = {"geometry": "MultiPolygon", "properties": src.schema.get("properties", {})}
 
         if not args.quiet:
             print(f"Reading {src_path} layer={args.layer} CRS={src_crs} bbox={bbox_src}")
             print(f"Writing {out_path} CRS={out_crs}")
 
         count = 0
-        preview_geoms = []
-        with fiona.open(out_path.as_posix(), mode="w", driver="GeoJSON", schema=out_schema, crs=out_crs) as dst:
-            for feat in src.filter(bbox=bbox_src):
+        sink = _PreviewSink() if args.preview else None
+        batch: list = []
+        batch_props: list = []
+        # Stream the FeatureCollection ourselves: shapely.to_geojson
+        # serializes each geometry in GEOS C code, skipping the nested
+        # dict tree that mapping() + fiona's writer would build per feature.
+        ndjson = _is_ndjson(out_path)
+        with out_path.open("w", encoding="utf-8", buffering=1 << 20) as dst:
+            if not ndjson:
+                dst.write('{"type":"FeatureCollection","features":[\n')
+
+            def _flush() -> None:
+                nonlocal count
+                for sg_t, props in zip(_reproject_batch(batch, transformer), batch_props):
+                    if sg_t.is_empty:
+                        continue
+                    # Native Polygon/MultiPolygon both serialize fine;
+                    # the old writer's MultiPolygon schema forced a GEOS
+                    # wrapper construction per single-part feature.
+                    if sg_t.geom_type not in ("Polygon", "MultiPolygon"):
+                        continue
+                    line = (
+                        f'{{"type":"Feature","properties":{_dumps_props(props)},'
+                        f'"geometry":{shapely.to_geojson(sg_t)}}}'
+                    )
+                    if ndjson:
+                        dst.write(line)
+                        dst.write("\n")
+                    else:
+                        if count:
+                            dst.write(",\n")
+                        dst.write(line)
+                    count += 1
+                    if sink is not None:
+                        sink.add(sg_t)
+                batch.clear()
+                batch_props.clear()
+
+            def _feature_iter():
+                it = None
+                try:
+                    it = src.filter(bbox=bbox_src, where=_GEOM_WHERE)
+                    first = next(it)
+                except StopIteration:
+                    return
+                except Exception:
+                    # Driver rejected the where clause; read unfiltered.
+                    yield from src.filter(bbox=bbox_src)
+                    return
+                yield first
+                yield from it
+
+            for feat in _feature_iter():
                 geom = feat.get("geometry")
                 if not geom:
                     continue
@@ -105,45 +534,32 @@ def extract(argv: list[str]) -> int:
                 # Drop non-polygonal geometries
                 if sg.geom_type not in ("Polygon", "MultiPolygon"):
                     continue
-                try:
-                    sg_t = shp_transform(transformer.transform, sg)
-                except Exception:
-                    continue
-                if sg_t.is_empty:
-                    continue
-                if sg_t.geom_type == "Polygon":
-                    sg_t = ShpMultiPolygon([sg_t])
-                elif sg_t.geom_type != "MultiPolygon":
-                    continue
-                feat_out = {"type": "Feature", "geometry": shp_mapping(sg_t), "properties": feat.get("properties", {})}
-                dst.write(feat_out)
-                count += 1
-                if args.preview:
-                    preview_geoms.append(sg_t)
+                batch.append(sg)
+                batch_props.append(feat.get("properties", {}))
+                if len(batch) >= _BATCH_SIZE:
+                    _flush()
+            if batch:
+                _flush()
+            if not ndjson:
+                dst.write("\n]}\n")
 
         if not args.quiet:
             print(f"Wrote {count} features -> {out_path}")
 
-        if args.preview:
-            _write_svg_preview(preview_geoms, out_path, width=args.preview_width, quiet=args.quiet)
+        if sink is not None:
+            _write_svg_preview(sink, out_path, width=args.preview_width, quiet=args.quiet)
+            sink.close()
 
     return 0 
 
 
-def _write_svg_preview(geoms, out_path: Path, width: int = 1024, quiet: bool = False) -> None:
-    # Determine bounds
-    if not geoms:
+def _write_svg_preview(sink: _PreviewSink, out_path: Path, width: int = 1024, quiet: bool = False) -> None:
+    # Bounds were accumulated while features streamed through the sink.
+    if not sink.count:
         if not quiet:
             print("No geometries for preview; skipping SVG.")
         return
-    xmin = ymin = float("inf")
-    xmax = ymax = float("-inf")
-    for g in geoms:
-        x0, y0, x1, y1 = g.bounds
-        if x0 < xmin: xmin = x0
-        if y0 < ymin: ymin = y0
-        if x1 > xmax: xmax = x1
-        if y1 > ymax: ymax = y1
+    xmin, ymin, xmax, ymax = sink.xmin, sink.ymin, sink.xmax, sink.ymax
     if not (xmin < xmax and ymin < ymax):
         if not quiet:
             print("Invalid bounds for preview; skipping SVG.")
@@ -157,53 +573,100 @@ def _write_svg_preview(geoms, out_path: Path, width: int = 1024, quiet: bool = F
     height = int(draw_w * (world_h / world_w)) + 2 * margin
     draw_h = max(1, height - 2 * margin)
 
-    def to_px(x, y):
-        px = margin + (x - xmin) / world_w * draw_w
-        py = margin + (ymax - y) / world_h * draw_h  # invert Y for screen coords
+    import numpy as np
+
+    scale_x = draw_w / world_w
+    scale_y = draw_h / world_h
+    # World-space footprint of one pixel: polygons smaller than this in
+    # both axes render as a single dot, so skip the full path for them.
+    min_world_w = world_w / draw_w
+    min_world_h = world_h / draw_h
+
+    def project(coords):
+        # Project to integer decipixels in NumPy: two affine array ops
+        # plus one rounding pass per axis, instead of Python math per
+        # vertex (Y inverted for screen coords). The enclosing scale(0.1)
+        # group restores pixel units at 0.1 px resolution.
+        px = np.rint((margin + (coords[:, 0] - xmin) * scale_x) * 10.0).astype(np.int64)
+        py = np.rint((margin + (ymax - coords[:, 1]) * scale_y) * 10.0).astype(np.int64)
         return px, py
 
-    # Build SVG paths
-    path_elems = []
-    # Light background
-    bg = f'<rect x="0" y="0" width="{width}" height="{height}" fill="#ffffff"/>'
-    border = f'<rect x="0.5" y="0.5" width="{width-1}" height="{height-1}" fill="none" stroke="#cccccc"/>'
-
-    for g in geoms:
-        # Iterate parts
-        parts = []
-        for poly in g.geoms:
-            # Exterior
-            coords = poly.exterior.coords
-            if not coords:
-                continue
-            d = []
-            for i, (x, y) in enumerate(coords):
-                px, py = to_px(x, y)
-                cmd = 'M' if i == 0 else 'L'
-                d.append(f"{cmd}{px:.1f},{py:.1f}")
-            d.append('Z')
-            # Interiors (holes)
-            for ring in poly.interiors:
-                ring_coords = ring.coords
-                if not ring_coords:
-                    continue
-                for j, (x, y) in enumerate(ring_coords):
-                    px, py = to_px(x, y)
-                    cmd = 'M' if j == 0 else 'L'
-                    d.append(f"{cmd}{px:.1f},{py:.1f}")
-                d.append('Z')
-            parts.append(' '.join(d))
-        if not parts:
-            continue
-        path_d = ' '.join(parts)
-        path_elems.append(f'<path d="{path_d}" fill="#1f77b4" fill-opacity="0.35" stroke="#1f77b4" stroke-width="0.8"/>')
-
-    svg = (
+    def ring_d(px, py) -> str:
+        # Source vertices sit at sub-meter spacing; at preview scale most
+        # collapse onto the same decipixel. Keeping only points that move
+        # the pen shrinks paths by 10-100x with pixel-identical output.
+        if len(px) > 2:
+            keep = np.empty(len(px), dtype=bool)
+            keep[0] = True
+            np.logical_or(px[1:] != px[:-1], py[1:] != py[:-1], out=keep[1:])
+            px = px[keep]
+            py = py[keep]
+        pts = np.char.add(np.char.add(np.char.mod("%d", px), ","), np.char.mod("%d", py))
+        return "M" + "L".join(pts.tolist()) + "Z"
+
+    # Assemble the document in one StringIO buffer; appending fragments
+    # to lists and re-joining per path churns the allocator on large
+    # previews.
+    buf = io.StringIO()
+    buf.write(
         f"<svg xmlns='http://www.w3.org/2000/svg' width='{width}' height='{height}' viewBox='0 0 {width} {height}'>"
-        f"{bg}{border}{''.join(path_elems)}</svg>"
     )
+    # Light background
+    buf.write(f'<rect x="0" y="0" width="{width}" height="{height}" fill="#ffffff"/>')
+    buf.write(f'<rect x="0.5" y="0.5" width="{width-1}" height="{height-1}" fill="none" stroke="#cccccc"/>')
+    # Shared paint attributes live on the group; stroke-width is in
+    # decipixels to match the scaled coordinate space.
+    buf.write('<g transform="scale(0.1)" fill="#1f77b4" fill-opacity="0.35" stroke="#1f77b4" stroke-width="8">')
+
+    for polys in sink:
+        open_path = False
+        for exterior, interiors in polys:
+            if not len(exterior):
+                continue
+            a = np.asarray(exterior)
+            gx0, gy0 = a.min(axis=0)
+            gx1, gy1 = a.max(axis=0)
+            if (gx1 - gx0) < min_world_w and (gy1 - gy0) < min_world_h:
+                # Sub-pixel at preview scale: one 1 px rect carries the
+                # same visual information as the full outline.
+                if open_path:
+                    buf.write('"/>')
+                    open_path = False
+                rx = round((margin + (gx0 - xmin) * scale_x) * 10.0)
+                ry = round((margin + (ymax - gy1) * scale_y) * 10.0)
+                buf.write(f'<rect x="{rx}" y="{ry}" width="10" height="10" stroke="none"/>')
+                continue
+            # Concatenate this polygon's rings into one contiguous buffer
+            # (ring lengths are known, so the allocation happens once) and
+            # project them in a single vectorized pass.
+            rings = [a]
+            rings.extend(np.asarray(r) for r in interiors if len(r))
+            lens = [len(r) for r in rings]
+            coords = rings[0] if len(rings) == 1 else np.concatenate(rings)
+            px = py = None
+            if _ring_pixels is None:
+                px, py = project(coords)
+            pos = 0
+            for n in lens:
+                if _ring_pixels is not None:
+                    # Fused jitted pass: project, round and dedup in one
+                    # loop over the ring's slice of the buffer.
+                    rpx, rpy = _ring_pixels(coords[pos:pos + n], xmin, ymax, scale_x, scale_y, float(margin))
+                else:
+                    rpx, rpy = px[pos:pos + n], py[pos:pos + n]
+                if open_path:
+                    buf.write(' ')
+                else:
+                    buf.write('<path d="')
+                    open_path = True
+                buf.write(ring_d(rpx, rpy))
+                pos += n
+        if open_path:
+            buf.write('"/>')
+
+    buf.write("</g></svg>")
     svg_path = out_path.with_suffix('.svg')
-    svg_path.write_text(svg, encoding='utf-8')
+    svg_path.write_text(buf.getvalue(), encoding='utf-8')
     if not quiet:
         print(f"Preview written -> {svg_path}")
 